@@ -23,8 +23,7 @@ public:
     size_t countCharacterOccurrences(const char* str, size_t length, char targetChar,
                                    PerformanceMetrics& metrics) override {
         
-        auto startTime = std::chrono::high_resolution_clock::now();
-        
+        // Timing is done by the caller around whole batches of calls
         size_t occurrences = 0;
         
         // Serial algorithm: iterate through each character and count target occurrences
@@ -33,12 +32,8 @@ public:
                 occurrences++;
             }
         }
-       
-        auto endTime = std::chrono::high_resolution_clock::now();
-        auto duration = std::chrono::duration_cast<std::chrono::nanoseconds>(endTime - startTime);
         
         // Fill performance metrics
-        metrics.executionTimeMs = duration.count() / 1000000.0; // Convert to milliseconds
         metrics.memoryUsedBytes = length;
         metrics.stringLength = length;
         metrics.totalCharacters = length - 1; // Exclude null terminator
@@ -77,40 +72,28 @@ void runPerformanceAnalysis(SerialCharacterCounter& counter, const TestConfigura
         
         std::cout << "Searching for character '" << config.targetCharacter << "'..." << std::endl;
         
-        // Performance measurements
-        std::vector<double> executionTimes;
-        size_t totalOccurrences = 0;
-        
-        // Run multiple repetitions with same string
-        for (int rep = 0; rep < config.repetitions; ++rep) {
-            PerformanceMetrics metrics;
-            
-            size_t occurrences = counter.countCharacterOccurrences(
+        // Time the repetitions in batches with one TSC read pair per batch, so
+        // the timer's own cost doesn't swamp nanosecond-scale runs
+        PerformanceMetrics metrics;
+        auto operation = [&]() -> size_t {
+            return counter.countCharacterOccurrences(
                 static_cast<char*>(aligned), config.stringLength, config.targetCharacter, metrics);
-            
-            executionTimes.push_back(metrics.executionTimeMs);
-            
-            // Store occurrences from first run (should be identical across runs)
-            if (rep == 0) {
-                totalOccurrences = occurrences;
-            }
-            
-            // Show progress for long tests
-            if (config.repetitions > 10 && (rep + 1) % (config.repetitions / 10) == 0) {
-                std::cout << "Progress: " << ((rep + 1) * 100 / config.repetitions) << "%" << std::endl;
-            }
-        }
+        };
         
-        // Calculate performance statistics
+        std::vector<double> executionTimes = HighPrecisionTimer::measureExecutionTimes(
+            operation, config.repetitions);
+        size_t totalOccurrences = operation();
+        
+        // Calculate performance statistics across batches
         double totalTime = std::accumulate(executionTimes.begin(), executionTimes.end(), 0.0);
-        double avgTime = totalTime / config.repetitions;
+        double avgTime = totalTime / executionTimes.size();
         
         // Calculate standard deviation
         double variance = 0;
         for (double time : executionTimes) {
             variance += (time - avgTime) * (time - avgTime);
         }
-        double stdDev = std::sqrt(variance / config.repetitions);
+        double stdDev = std::sqrt(variance / executionTimes.size());
         
         // Find min/max times
         double minTime = *std::min_element(executionTimes.begin(), executionTimes.end());
@@ -140,6 +123,8 @@ void runPerformanceAnalysis(SerialCharacterCounter& counter, const TestConfigura
         std::cout << "Alignment Check: " << (address % config.alignment == 0 ? "PASSED" : "FAILED") << std::endl;
         std::cout << "Address modulo alignment: " << (address % config.alignment) << std::endl;
         
+        publishSharedResult(config.sharedResult, config, avgTime, stdDev, avgThroughput);
+        
         // CSV output
         if (config.exportCSV) {
             std::cout << "\n=== CSV Export ===" << std::endl;
@@ -159,7 +144,7 @@ void runPerformanceAnalysis(SerialCharacterCounter& counter, const TestConfigura
     }
 }
 
-int main() {
+int main(int argc, char* argv[]) {
     std::cout << "======================================================" << std::endl;
     std::cout << "   Serial Character Occurrence Counting             " << std::endl;
     std::cout << "   CE-4302 Arquitectura de Computadores II           " << std::endl;
@@ -167,17 +152,43 @@ int main() {
     
     SerialCharacterCounter counter;
     
-    try {
-        // Get user configuration
-        TestConfiguration config = getUserConfiguration();
-        validateConfiguration(config);
-        
-        // Run main performance analysis
-        runPerformanceAnalysis(counter, config);
+    // Optional "--shm <name>": also publish each result to a driver's shared memory
+    SharedResultRecord* sharedResult = nullptr;
+    if (argc == 3 && std::string(argv[1]) == "--shm") {
+        try {
+            sharedResult = openSharedResultRecord(argv[2]);
+        } catch (const std::exception& e) {
+            std::cerr << "Error: " << e.what() << std::endl;
+            return 1;
+        }
+    }
+    
+    int status = 0;
+    
+    // Run by hand, process a single configuration. A driver (--shm) instead
+    // streams a whole sweep through one process until stdin is exhausted
+    do {
+        try {
+            // Get user configuration
+            TestConfiguration config = getUserConfiguration();
+            validateConfiguration(config);
+            config.sharedResult = sharedResult;
+            
+            // Run main performance analysis
+            runPerformanceAnalysis(counter, config);
+            
+        } catch (const std::exception& e) {
+            std::cerr << "Error: " << e.what() << std::endl;
+            status = 1;
+        }
         
-    } catch (const std::exception& e) {
-        std::cerr << "Error: " << e.what() << std::endl;
-        return 1;
+        if (sharedResult) {
+            printTestEndMarker();
+        }
+    } while (sharedResult && !(std::cin >> std::ws).eof());
+    
+    if (status != 0) {
+        return status;
     }
     
     std::cout << "\nSerial character occurrence counting completed successfully!" << std::endl;
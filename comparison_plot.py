@@ -2,205 +2,492 @@
 """
 CE-4302 Arquitectura de Computadores II - Taller 02
 """
-import subprocess
+import matplotlib
+matplotlib.use('Agg')  # Only writes PNG files; never needs an interactive backend
+matplotlib.rcParams['path.simplify'] = True
+matplotlib.rcParams['path.simplify_threshold'] = 1.0
 import matplotlib.pyplot as plt
+import argparse
+import functools
+import subprocess
 import numpy as np
+import itertools
+import math
 import os
 import sys
-from typing import Dict, List
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
 
 class PerformanceComparison:
-    def __init__(self, serial_executable="./char_count_serial", simd_executable="./char_count_simd"):
+    # Line the test binaries print after each configuration they process
+    TEST_END_MARKER = b"=== End of Test ==="
+    # Layout of SharedResultRecord in utils.h: sequence, stringLength, alignment,
+    # repetitions (uint64) then avgTimeMs, stdDevMs, throughputMBps (double)
+    RESULT_RECORD = struct.Struct('=QQQQddd')
+    
+    # Adaptive repetitions: a pilot run estimates the per-call time and its spread,
+    # then the real run uses just enough repetitions for the mean's standard error
+    # to reach TARGET_RELATIVE_ERROR within MEASUREMENT_BUDGET_S. The binaries time
+    # repetitions in BATCHES batches and report the spread of the batch averages,
+    # so the pilot grows until each batch lasts MIN_BATCH_TIME_MS, keeping the
+    # ~30-60 ns TSC read pair to a few percent of what it measures
+    BATCHES = 10  # measureExecutionTimes' default in utils.h
+    PILOT_REPETITIONS = 20
+    MIN_BATCH_TIME_MS = 0.002
+    MIN_REPETITIONS = 100  # Keeps a single timing spike from dominating the mean
+    MAX_REPETITIONS = 1000  # Upper bound accepted by the binaries
+    TARGET_RELATIVE_ERROR = 0.01
+    MEASUREMENT_BUDGET_S = 0.1
+    
+    # Every measured configuration: (results key, label, executable attribute, alignment,
+    # plot style as (format, marker face color, marker edge color)). Sweeps, result
+    # storage, the printed report and the plot legend are all driven by this table
+    CONFIGS = [
+        ('Serial_16', 'Serial (16B aligned)', 'serial_executable', 16, ('b-o', 'lightblue', 'blue')),
+        ('SIMD_16', 'SIMD (16B aligned)', 'simd_executable', 16, ('r-s', 'lightcoral', 'red')),
+        ('SIMD_32', 'SIMD (32B aligned)', 'simd_executable', 32, ('m-D', 'violet', 'purple')),
+        ('SIMD_unaligned', 'SIMD (unaligned)', 'simd_executable', 1, ('g-^', 'lightgreen', 'green'))]
+    # CONFIGS row whose slowest time the plot normalizes to 1.0
+    BASELINE_CONFIG = 'Serial_16'
+    
+    def __init__(self, serial_executable="./char_count_serial", simd_executable="./char_count_simd",
+                 verbose: bool = True, use_cache: bool = False):
         self.serial_executable = serial_executable
         self.simd_executable = simd_executable
-        self.results = {
-            'Serial_16': {'sizes': [], 'times': [], 'throughputs': []},
-            'SIMD_16': {'sizes': [], 'times': [], 'throughputs': []},
-            'SIMD_32': {'sizes': [], 'times': [], 'throughputs': []},
-            'SIMD_unaligned': {'sizes': [], 'times': [], 'throughputs': []}}
+        self.verbose = verbose
+        # Opt-in: successful measurements keyed by _measurement_key(), reused by
+        # later sweeps of this instance instead of running the test again
+        self.use_cache = use_cache
+        self._measurement_cache = {}
+        # Each series is a set of preallocated arrays; only the first 'n' entries are valid
+        self.results = {config_name: self._empty_series() for config_name, *_ in self.CONFIGS}
+        self.fig = None
+        self._local = threading.local()
+        self._workers = []
+        self._worker_maps = []
+        self._workers_lock = threading.Lock()
         
+    @staticmethod
+    def _empty_series() -> Dict:
+        return {'sizes': np.empty(0, dtype=np.int64),
+                'times': np.empty(0, dtype=np.float64),
+                'throughputs': np.empty(0, dtype=np.float64),
+                'n': 0}
+    
+    def _reserve(self, config_name: str, count: int):
+        """Grow a series' arrays so that count more results fit without reallocating"""
+        
+        series = self.results[config_name]
+        needed = series['n'] + count
+        if needed > len(series['sizes']):
+            for key in ('sizes', 'times', 'throughputs'):
+                grown = np.empty(needed, dtype=series[key].dtype)
+                grown[:series['n']] = series[key][:series['n']]
+                series[key] = grown
+    
+    def _store(self, config_name: str, slot: int, size: int, result: Dict):
+        """Write a result (or NaN for a failed test) into a reserved slot past 'n'"""
+        
+        series = self.results[config_name]
+        series['sizes'][slot] = size
+        series['times'][slot] = result['avg_time_ms'] if result else np.nan
+        series['throughputs'][slot] = result['throughput_mbps'] if result else np.nan
+    
+    def _commit(self, config_name: str, count: int):
+        """Append the count slots written by _store, dropping failed tests"""
+        
+        series = self.results[config_name]
+        start = series['n']
+        stored = slice(start, start + count)
+        valid = ~np.isnan(series['times'][stored])
+        kept = int(valid.sum())
+        for key in ('sizes', 'times', 'throughputs'):
+            series[key][start:start + kept] = series[key][stored][valid]
+        series['n'] = start + kept
+    
+    def _get_worker(self, executable: str, cpu: int = None) -> Tuple[subprocess.Popen, shared_memory.SharedMemory]:
+        """Return this thread's long-lived process for executable and the shared memory
+        it publishes results to, spawning both on first use"""
+        
+        if not hasattr(self._local, 'workers'):
+            self._local.workers = {}
+        workers = self._local.workers
+        process, shm = workers.get(executable, (None, None))
+        
+        if process is None or process.poll() is not None:
+            if shm is None:
+                shm = shared_memory.SharedMemory(create=True, size=self.RESULT_RECORD.size)
+                shm.buf[:self.RESULT_RECORD.size] = bytes(self.RESULT_RECORD.size)
+            
+            # No preexec_fn and close_fds=False lets subprocess launch the child
+            # with posix_spawn instead of fork+exec. Our pipe fds are
+            # non-inheritable, so the child still only gets stdin/stdout/stderr
+            spawned = None
+            try:
+                spawned = subprocess.Popen(
+                    [executable, '--shm', '/' + shm.name],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    close_fds=False
+                )
+                
+                # Pin the child to its worker thread's CPU. Threads get one CPU per
+                # physical core, so concurrent tests don't share a core. The child
+                # is blocked reading stdin until the first test is sent
+                if cpu is not None:
+                    os.sched_setaffinity(spawned.pid, {cpu})
+            except OSError:
+                # Nothing is registered yet, so clean up here rather than in close_workers()
+                if spawned is not None:
+                    spawned.kill()
+                    spawned.communicate()
+                if executable not in workers:
+                    shm.close()
+                    shm.unlink()
+                raise
+            
+            process = spawned
+            workers[executable] = (process, shm)
+            with self._workers_lock:
+                self._workers.append((process, shm))
+                # Registered until close_workers() forgets the workers it shut down
+                if not any(worker_map is workers for worker_map in self._worker_maps):
+                    self._worker_maps.append(workers)
+        
+        return process, shm
+    
+    def close_workers(self):
+        """Shut down every long-lived test process and release its shared memory"""
+        
+        with self._workers_lock:
+            workers, self._workers = self._workers, []
+            worker_maps, self._worker_maps = self._worker_maps, []
+            # Forget every thread's workers so the next test spawns a fresh
+            # process and segment instead of reusing the released ones
+            for thread_workers in worker_maps:
+                thread_workers.clear()
+        
+        segments = {}
+        for process, shm in workers:
+            try:
+                process.stdin.close()
+                process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+            process.stdout.close()
+            # A respawned worker reuses its predecessor's segment
+            segments[shm.name] = shm
+        
+        for shm in segments.values():
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass  # Already removed by someone else
+    
     def run_single_test(self, executable: str, string_length: int, alignment: int = 16, 
-                   target_char: str = ';', repetitions: int = 100) -> Dict:
+                   target_char: str = ';', repetitions: int = 100, cpu: int = None) -> Dict:
         """Run a single performance test with multiple repetitions for better timing resolution"""
         
-        input_data = f"{target_char}\n{string_length}\n{alignment}\n{repetitions}\nn\ny\n"
+        # Results come back through shared memory, so CSV export is turned off
+        input_data = f"{target_char}\n{string_length}\n{alignment}\n{repetitions}\nn\nn\n"
         
         try:
-            process = subprocess.Popen(
-                [executable],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            stdout, stderr = process.communicate(input=input_data, timeout=60)
+            process, shm = self._get_worker(executable, cpu)
+            last_sequence = self.RESULT_RECORD.unpack_from(shm.buf)[0]
             
-            if process.returncode != 0:
-                print(f"Error running {executable} (return code {process.returncode}): {stderr}")
-                return None
+            # Kill the worker if it stops answering; readline then sees EOF
+            watchdog = threading.Timer(60, process.kill)
+            watchdog.start()
+            try:
+                process.stdin.write(input_data.encode('ascii'))
+                process.stdin.flush()
                 
-            # Parse the CSV output from stdout
-            lines = stdout.strip().split('\n')
-            
-            for line in lines:
-                if 'StringLength,Alignment,TargetChar,TotalChars,Occurrences,AvgTimeMs' in line:
-                    idx = lines.index(line)
-                    if idx + 1 < len(lines):
-                        csv_line = lines[idx + 1]
-                        parts = csv_line.split(',')
-                        
-                        return {
-                            'string_length': int(parts[0]),
-                            'alignment': int(parts[1]),  # Add alignment to return dict
-                            'avg_time_ms': float(parts[5]),
-                            'throughput_mbps': float(parts[9])
-                        }
+                # Drain this test's console output, one line at a time and without
+                # storing it, up to the end-of-test marker so the worker stays in step
+                for line in process.stdout:
+                    if line.rstrip(b'\n') == self.TEST_END_MARKER:
+                        break
+                else:
+                    if watchdog.finished.is_set():
+                        print(f"Timeout running {executable}")
+                    else:
+                        print(f"Error running {executable} (return code {process.wait()})")
+                    return None
+            finally:
+                watchdog.cancel()
+                
+            # Read the binary result record; an unchanged sequence means the test failed
+            (sequence, length, record_alignment, record_repetitions,
+             avg_time_ms, std_time_ms, throughput_mbps) = self.RESULT_RECORD.unpack_from(shm.buf)
+            if sequence != last_sequence:
+                return {
+                    'string_length': length,
+                    'alignment': record_alignment,
+                    'repetitions': record_repetitions,
+                    'avg_time_ms': avg_time_ms,
+                    'std_time_ms': std_time_ms,
+                    'throughput_mbps': throughput_mbps
+                }
             
-            print(f"Could not parse output from {executable}")
+            print(f"No result published by {executable}")
             return None
             
-        except subprocess.TimeoutExpired:
-            print(f"Timeout running {executable}")
-            process.kill()
-            return None
         except Exception as e:
             print(f"Error running {executable}: {e}")
             return None
     
+    @staticmethod
+    def _physical_core_cpus() -> List[int]:
+        """One allowed logical CPU per physical core, so that concurrent tests never
+        run on SMT siblings that share a core's execution units and L1/L2 caches"""
+        
+        allowed = os.sched_getaffinity(0)
+        cpus = []
+        seen = set()
+        for cpu in sorted(allowed):
+            try:
+                with open(f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list") as f:
+                    siblings_list = f.read().strip()
+            except OSError:
+                siblings_list = str(cpu)  # No topology information: assume no SMT
+            
+            # The list looks like "0,4" or "0-1"
+            siblings = set()
+            for part in siblings_list.split(','):
+                first, _, last = part.partition('-')
+                siblings.update(range(int(first), int(last or first) + 1))
+            
+            core = frozenset(siblings)
+            if core not in seen:
+                seen.add(core)
+                cpus.append(cpu)
+        return cpus
+    
+    def _bind_worker_thread(self, cpu_ids):
+        """Thread pool initializer: give each worker thread its own CPU"""
+        self._local.cpu = next(cpu_ids)
+    
+    def _run_pilot(self, executable: str, string_length: int, alignment: int,
+                   target_char: str, cpu: int = None) -> Tuple[int, Optional[Dict]]:
+        """Run the test with growing repetition counts until its batches are long
+        enough to time accurately (or MAX_REPETITIONS is reached)"""
+        
+        repetitions = self.PILOT_REPETITIONS
+        while True:
+            pilot = self.run_single_test(executable, string_length, alignment, target_char,
+                                         repetitions, cpu=cpu)
+            if not pilot or repetitions >= self.MAX_REPETITIONS:
+                return repetitions, pilot
+            
+            batch_time_ms = pilot['avg_time_ms'] * repetitions / self.BATCHES
+            if batch_time_ms >= self.MIN_BATCH_TIME_MS:
+                return repetitions, pilot
+            
+            # Short batches overstate the per-call time, so grow at least twofold
+            growth = self.MIN_BATCH_TIME_MS / batch_time_ms if batch_time_ms > 0 else 2
+            repetitions = min(self.MAX_REPETITIONS, max(2 * repetitions, math.ceil(repetitions * growth)))
+    
+    def _choose_repetitions(self, executable: str, string_length: int, alignment: int,
+                            target_char: str, cpu: int = None) -> Tuple[Optional[int], Optional[Dict]]:
+        """Pick a repetition count from a pilot run of the same test. Returns it with
+        the pilot's result, or (None, None) if the pilot itself failed"""
+        
+        pilot_repetitions, pilot = self._run_pilot(executable, string_length, alignment,
+                                                   target_char, cpu)
+        if not pilot:
+            return None, None
+        if pilot['avg_time_ms'] <= 0:
+            return self.MAX_REPETITIONS, pilot
+        
+        # The reported spread is between batch averages; averaging batch_size
+        # calls divides the per-call standard deviation by sqrt(batch_size)
+        batch_size = pilot_repetitions / self.BATCHES
+        per_call_spread = pilot['std_time_ms'] * math.sqrt(batch_size) / pilot['avg_time_ms']
+        needed = math.ceil((per_call_spread / self.TARGET_RELATIVE_ERROR) ** 2)
+        affordable = int(self.MEASUREMENT_BUDGET_S / (pilot['avg_time_ms'] / 1000.0))
+        
+        # Never use shorter batches than the pilot needed for accurate timing
+        floor = max(self.MIN_REPETITIONS, pilot_repetitions)
+        return max(floor, min(needed, affordable, self.MAX_REPETITIONS)), pilot
+    
+    def _run_pinned_test(self, executable: str, string_length: int, alignment: int,
+                         target_char: str) -> Dict:
+        """Run a single adaptively repeated test on the CPU owned by the calling worker thread"""
+        
+        cpu = self._local.cpu
+        repetitions, pilot = self._choose_repetitions(executable, string_length, alignment,
+                                                      target_char, cpu)
+        
+        # Don't rerun a test whose pilot already failed (or timed out), nor one
+        # whose pilot already ran with the chosen repetition count
+        if repetitions is None or repetitions == pilot['repetitions']:
+            return pilot
+        return self.run_single_test(executable, string_length, alignment, target_char,
+                                    repetitions, cpu=cpu)
+    
+    def _measurement_key(self, executable: str, string_length: int, alignment: int,
+                         target_char: str) -> Tuple:
+        """Identify a measurement for the cache"""
+        return (os.path.realpath(executable), string_length, alignment, target_char)
+    
     def run_comparison_tests(self, string_sizes: List[int], target_char: str = ';'):
         """Run comparison tests for specified string sizes"""
         
         print("=== Performance Comparison ===")
         print(f"String sizes: {string_sizes}")
         print(f"Target character: '{target_char}'")
-        print("Testing: Serial, SIMD (16B aligned), SIMD (unaligned)\n")
+        print(f"Testing: {', '.join(label for _, label, *_ in self.CONFIGS)}\n")
         
-        for size in string_sizes:
-            print(f"Testing string length: {size} bytes")
-            
-            # Adjust repetitions based on size for better timing resolution
-            if size <= 1024:
-                repetitions = 1000
-            elif size <= 8192:
-                repetitions = 500
-            else:
-                repetitions = 100
-            
-            print(f"  Using {repetitions} repetitions for this size")
-            
-            # Test Serial implementation (16-byte aligned)
-            print("  Running Serial implementation...")
-            serial_result = self.run_single_test(self.serial_executable, size, 16, target_char, repetitions)
-            
-            if serial_result:
-                self.results['Serial_16']['sizes'].append(size)
-                self.results['Serial_16']['times'].append(serial_result['avg_time_ms'])
-                self.results['Serial_16']['throughputs'].append(serial_result['throughput_mbps'])
-                print(f"    Serial (16B): {serial_result['avg_time_ms']:.6f} ms")
-            
-            # Test SIMD implementation (16-byte aligned)
-            print("  Running SIMD implementation (16B aligned)...")
-            simd_result = self.run_single_test(self.simd_executable, size, 16, target_char, repetitions)
-            
-            if simd_result:
-                self.results['SIMD_16']['sizes'].append(size)
-                self.results['SIMD_16']['times'].append(simd_result['avg_time_ms'])
-                self.results['SIMD_16']['throughputs'].append(simd_result['throughput_mbps'])
-                print(f"    SIMD (16B):   {simd_result['avg_time_ms']:.6f} ms")
-            
-            # Test SIMD implementation (unaligned)
-            print("  Running SIMD implementation (unaligned)...")
-            simd_unaligned_result = self.run_single_test(self.simd_executable, size, 1, target_char, repetitions)
-            
-            if simd_unaligned_result:
-                self.results['SIMD_unaligned']['sizes'].append(size)
-                self.results['SIMD_unaligned']['times'].append(simd_unaligned_result['avg_time_ms'])
-                self.results['SIMD_unaligned']['throughputs'].append(simd_unaligned_result['throughput_mbps'])
-                print(f"    SIMD (unaligned): {simd_unaligned_result['avg_time_ms']:.6f} ms")
-            
-            # Test SIMD implementation (32-byte aligned)
-            print("  Running SIMD implementation (32B aligned)...")
-            simd_32_result = self.run_single_test(self.simd_executable, size, 32, target_char, repetitions)
-
-            if simd_32_result:
-                self.results['SIMD_32']['sizes'].append(size)
-                self.results['SIMD_32']['times'].append(simd_32_result['avg_time_ms'])
-                self.results['SIMD_32']['throughputs'].append(simd_32_result['throughput_mbps'])
-                print(f"    SIMD (32B):   {simd_32_result['avg_time_ms']:.6f} ms")
+        configs = [(config_name, label, getattr(self, executable_attr), alignment)
+                   for config_name, label, executable_attr, alignment, _ in self.CONFIGS]
+        
+        # Every (size, config) test is an independent child process, so run them
+        # concurrently with one worker thread per available physical core
+        cpus = self._physical_core_cpus()
+        cpu_ids = itertools.cycle(cpus)
+        
+        # Results are written straight into slots reserved past each series' end,
+        # in sweep order so every series stays sorted by size
+        for config_name, _, _, _ in configs:
+            self._reserve(config_name, len(string_sizes))
+        
+        with ThreadPoolExecutor(max_workers=len(cpus), initializer=self._bind_worker_thread,
+                                initargs=(cpu_ids,)) as executor:
+            # Identical measurements within a sweep are run once, and with use_cache
+            # also reused from this instance's earlier sweeps
+            pending = {}
+            cached = set()
+            for position, size in enumerate(string_sizes):
+                for config_name, _, executable, alignment in configs:
+                    slot = self.results[config_name]['n'] + position
+                    key = self._measurement_key(executable, size, alignment, target_char)
+                    
+                    if self.use_cache and key in self._measurement_cache:
+                        self._store(config_name, slot, size, self._measurement_cache[key])
+                        cached.add((config_name, position))
+                    elif key in pending:
+                        pending[key][1].append((config_name, slot, size))
+                    else:
+                        future = executor.submit(self._run_pinned_test, executable, size,
+                                                 alignment, target_char)
+                        pending[key] = (future, [(config_name, slot, size)])
             
-            print()
+            futures = {future: (key, targets) for key, (future, targets) in pending.items()}
+            for future in as_completed(futures):
+                key, targets = futures[future]
+                result = future.result()
+                if result and self.use_cache:
+                    self._measurement_cache[key] = result
+                for config_name, slot, size in targets:
+                    self._store(config_name, slot, size, result)
+        
+        self.close_workers()
+        
+        # Build a one-line summary per size that is printed in one go
+        if self.verbose:
+            report = []
+            for position, size in enumerate(string_sizes):
+                timings = []
+                for config_name, label, _, _ in configs:
+                    series = self.results[config_name]
+                    time_ms = series['times'][series['n'] + position]
+                    timing = f"{label}: failed" if np.isnan(time_ms) else f"{label}: {time_ms:.6f} ms"
+                    if (config_name, position) in cached:
+                        timing += " (cached)"
+                    timings.append(timing)
+                report.append(f"{size:>6} bytes | " + " | ".join(timings))
+            print("\n".join(report) + "\n")
+        
+        for config_name, _, _, _ in configs:
+            self._commit(config_name, len(string_sizes))
     
     def create_normalized_time_plot(self, output_dir: str = "comparison_plots"):
         """Create a single plot comparing normalized execution times"""
         
         # Verify we have data for all configurations
-        required_configs = ['Serial_16', 'SIMD_16', 'SIMD_32', 'SIMD_unaligned']
+        required_configs = [config_name for config_name, *_ in self.CONFIGS]
         for config in required_configs:
-            if not self.results[config]['sizes']:
+            if not self.results[config]['n']:
                 print(f"Missing data for {config}")
                 return
         
         os.makedirs(output_dir, exist_ok=True)
         
-        plt.figure(figsize=(12, 8))
-        
         # Get common sizes where all implementations have data
-        common_sizes = sorted(set(
-            self.results['Serial_16']['sizes'] +
-            self.results['SIMD_16']['sizes'] +
-            self.results['SIMD_32']['sizes'] +
-            self.results['SIMD_unaligned']['sizes']
-        ))
-        
-        if not common_sizes:
+        series = {config: (self.results[config]['sizes'][:self.results[config]['n']],
+                           self.results[config]['times'][:self.results[config]['n']])
+                  for config in required_configs}
+        common_sizes = functools.reduce(np.intersect1d, (sizes for sizes, _ in series.values()))
+        
+        if not len(common_sizes):
             print("No common sizes found for all implementations")
             return
         
-        # Normalize times relative to serial implementation
-        max_serial_time = max(self.results['Serial_16']['times'])
-        normalized_serial = [t/max_serial_time for t in self.results['Serial_16']['times']]
-        normalized_simd_16 = [t/max_serial_time for t in self.results['SIMD_16']['times']]
-        normalized_simd_32 = [t/max_serial_time for t in self.results['SIMD_32']['times']]
-        normalized_simd_unaligned = [t/max_serial_time for t in self.results['SIMD_unaligned']['times']]
+        # Look up each series by size so points stay aligned even if a test failed
+        common_times = {}
+        for config, (sizes, times) in series.items():
+            order = np.argsort(sizes, kind='stable')
+            common_times[config] = times[order][np.searchsorted(sizes[order], common_sizes)]
         
-        # Plot results with distinct styles
-        plt.loglog(common_sizes, normalized_serial, 'b-o', label='Serial (16B aligned)', 
-                linewidth=3, markersize=8, markerfacecolor='lightblue', markeredgecolor='blue')
+        # Reuse one figure across plots; clf() keeps its canvas and Agg buffers
+        if self.fig is None:
+            self.fig = plt.figure(figsize=(12, 8))
+        self.fig.clf()
+        ax = self.fig.add_subplot(111)
+        self._draw_normalized_time(ax, common_sizes, common_times)
+        
+        self.fig.tight_layout()
+        self.fig.savefig(f"{output_dir}/normalized_time_comparison.png", dpi=300, bbox_inches='tight')
         
-        plt.loglog(common_sizes, normalized_simd_16, 'r-s', label='SIMD (16B aligned)', 
-                linewidth=3, markersize=8, markerfacecolor='lightcoral', markeredgecolor='red')
+        print(f"Normalized execution time plot saved: {output_dir}/normalized_time_comparison.png")
+    
+    def close_figure(self):
+        """Release the figure shared by every plot"""
         
-        plt.loglog(common_sizes, normalized_simd_32, 'm-D', label='SIMD (32B aligned)', 
-                linewidth=3, markersize=8, markerfacecolor='violet', markeredgecolor='purple')
+        if self.fig is not None:
+            plt.close(self.fig)
+            self.fig = None
+    
+    def _draw_normalized_time(self, ax, common_sizes: np.ndarray, common_times: Dict):
+        """Draw the normalized execution time comparison onto ax"""
         
-        plt.loglog(common_sizes, normalized_simd_unaligned, 'g-^', label='SIMD (unaligned)', 
-                linewidth=3, markersize=8, markerfacecolor='lightgreen', markeredgecolor='green')
+        # Normalize times relative to the baseline configuration
+        baseline_max_time = common_times[self.BASELINE_CONFIG].max()
+        
+        # Plot results with distinct styles
+        for config, label, _, _, (fmt, face_color, edge_color) in self.CONFIGS:
+            ax.loglog(common_sizes, common_times[config] / baseline_max_time, fmt, label=label,
+                    linewidth=3, markersize=8, markerfacecolor=face_color, markeredgecolor=edge_color)
         
-        plt.xlabel('Input Vector Size (bytes)', fontsize=14, fontweight='bold')
-        plt.ylabel('Normalized Execution Time (Serial max = 1.0)', fontsize=14, fontweight='bold')
-        plt.title('Performance Comparison with data alignment\n(Serial vs SIMD)', 
+        ax.set_xlabel('Input Vector Size (bytes)', fontsize=14, fontweight='bold')
+        ax.set_ylabel('Normalized Execution Time (Serial max = 1.0)', fontsize=14, fontweight='bold')
+        ax.set_title('Performance Comparison with data alignment\n(Serial vs SIMD)', 
                 fontsize=16, fontweight='bold')
         
-        # Set custom X-axis ticks
-        plt.xticks(common_sizes, [str(size) for size in common_sizes], rotation=45)
-        plt.xscale('log', base=2)
-        plt.gca().get_xaxis().set_major_formatter(plt.ScalarFormatter())
+        # Base-2 log X axis with plain integer labels. set_xscale() installs its own
+        # locator, so labelling every size via xticks() first only built text
+        # artists that were thrown away before drawing
+        ax.set_xscale('log', base=2)
+        ax.get_xaxis().set_major_formatter(plt.ScalarFormatter())
+        ax.tick_params(axis='x', labelrotation=45)
         
-        plt.legend(fontsize=12, loc='upper left')
-        plt.grid(True, alpha=0.3, linestyle='--')
+        ax.legend(fontsize=12, loc='upper left')
+        ax.grid(True, alpha=0.3, linestyle='--')
         
         # Customize the plot
-        plt.gca().tick_params(labelsize=12)
-        plt.gca().set_facecolor('#f8f9fa')
-        
-        plt.tight_layout()
-        plt.savefig(f"{output_dir}/normalized_time_comparison.png", dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print(f"Normalized execution time plot saved: {output_dir}/normalized_time_comparison.png")
+        ax.tick_params(labelsize=12)
+        ax.set_facecolor('#f8f9fa')
 
 def main():
+    parser = argparse.ArgumentParser(description="Serial vs SIMD character counting comparison")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="don't print per-size timings")
+    args = parser.parse_args()
+    
     # Fixed string sizes as specified
     STRING_SIZES = [16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536]
     TARGET_CHAR = ';'
@@ -214,9 +501,10 @@ def main():
         print("Error: ./char_count_simd not found. Please compile first with 'make'")
         sys.exit(1)
     
-    comparison = PerformanceComparison()
+    comparison = PerformanceComparison(verbose=not args.quiet)
     comparison.run_comparison_tests(STRING_SIZES, TARGET_CHAR)
     comparison.create_normalized_time_plot()
+    comparison.close_figure()
     
     print("\nPerformance comparison completed! :3")
 
@@ -3,6 +3,10 @@
 #include <limits>
 #include <fstream>
 #include <numeric>
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
 
 // PerformanceMetrics implementation
 void PerformanceMetrics::print() const {
@@ -13,34 +17,10 @@ void PerformanceMetrics::print() const {
     std::cout << "Memory Alignment: " << alignment << " bytes" << std::endl;
     std::cout << "Total Characters: " << totalCharacters << std::endl;
     std::cout << "Occurrences Found: " << occurrences << std::endl;
-    std::cout << "Execution Time: " << executionTimeMs << " ms" << std::endl;
     std::cout << "Memory Used: " << memoryUsedBytes << " bytes" << std::endl;
-    std::cout << "Throughput: " << getThroughputMBps() << " MB/s" << std::endl;
-    std::cout << "Characters/sec: " << getCharactersPerSecond() << std::endl;
     std::cout << "=========================" << std::endl;
 }
 
-void PerformanceMetrics::printCSVHeader() const {
-    std::cout << "StringLength,Alignment,TargetChar,TotalChars,Occurrences,ExecutionTimeMs,ThroughputMBps,CharsPerSecond" << std::endl;
-}
-
-void PerformanceMetrics::printCSVRow() const {
-    std::cout << std::fixed << std::setprecision(6);
-    std::cout << stringLength << "," << alignment << "," << targetCharacter << "," << totalCharacters << "," 
-              << occurrences << "," << executionTimeMs << "," 
-              << getThroughputMBps() << "," << getCharactersPerSecond() << std::endl;
-}
-
-double PerformanceMetrics::getThroughputMBps() const {
-    if (executionTimeMs <= 0) return 0.0;
-    return (stringLength / (executionTimeMs / 1000.0)) / (1024.0 * 1024.0);
-}
-
-double PerformanceMetrics::getCharactersPerSecond() const {
-    if (executionTimeMs <= 0) return 0.0;
-    return totalCharacters / (executionTimeMs / 1000.0);
-}
-
 // RandomStringGenerator implementation
 RandomStringGenerator::RandomStringGenerator(uint32_t seed) : rng(seed), seed(seed) {}
 
@@ -140,36 +120,21 @@ void RandomStringGenerator::generateRandomUTF8(char* buffer, size_t length) {
 }
 
 // HighPrecisionTimer implementation
-std::vector<double> HighPrecisionTimer::measureExecutionTimes(
-    std::function<size_t()> operation, 
-    int repetitions, 
-    int warmup_runs) {
-    
-    std::vector<double> times;
-    times.reserve(repetitions);
-    
-    // Warmup runs to stabilize cache and CPU
-    for (int i = 0; i < warmup_runs; ++i) {
-        operation();
-    }
-    
-    for (int i = 0; i < repetitions; ++i) {
-        // Usar alta precisión temporal
-        auto start = std::chrono::high_resolution_clock::now();
-        
-        // Ejecutar la operación
-        operation();
-        
-        auto end = std::chrono::high_resolution_clock::now();
-        
-        // Convertir a microsegundos para mejor precisión
-        auto duration = std::chrono::duration_cast<std::chrono::nanoseconds>(end - start);
-        double time_ms = duration.count() / 1000000.0; // Convertir a ms
+double HighPrecisionTimer::cyclesToMs(uint64_t cycles) {
+    // Calibrate the TSC frequency once per process against the steady clock
+    static const double cyclesPerMs = []() {
+        auto wallStart = std::chrono::steady_clock::now();
+        uint64_t tscStart = startCycles();
+        while (std::chrono::steady_clock::now() - wallStart < std::chrono::milliseconds(10)) {
+        }
+        uint64_t tscEnd = stopCycles();
+        auto wallEnd = std::chrono::steady_clock::now();
         
-        times.push_back(time_ms);
-    }
+        double elapsedMs = std::chrono::duration<double, std::milli>(wallEnd - wallStart).count();
+        return (tscEnd - tscStart) / elapsedMs;
+    }();
     
-    return times;
+    return cycles / cyclesPerMs;
 }
 
 double HighPrecisionTimer::calculateMedian(std::vector<double> times) {
@@ -233,6 +198,9 @@ TestConfiguration getUserConfiguration() {
         std::cin >> config.stringLength;
         
         if (std::cin.fail() || config.stringLength < 16) {
+            if (std::cin.eof()) {
+                throw std::invalid_argument("Unexpected end of input");
+            }
             std::cin.clear();
             std::cin.ignore(std::numeric_limits<std::streamsize>::max(), '\n');
             std::cout << "Invalid input. Please enter a number >= 16." << std::endl;
@@ -247,6 +215,9 @@ TestConfiguration getUserConfiguration() {
         std::cin >> config.alignment;
         
         if (std::cin.fail() || !isPowerOfTwo(config.alignment)) {
+            if (std::cin.eof()) {
+                throw std::invalid_argument("Unexpected end of input");
+            }
             std::cin.clear();
             std::cin.ignore(std::numeric_limits<std::streamsize>::max(), '\n');
             std::cout << "Invalid input. Alignment must be a power of 2." << std::endl;
@@ -261,6 +232,9 @@ TestConfiguration getUserConfiguration() {
         std::cin >> config.repetitions;
         
         if (std::cin.fail() || config.repetitions < 1 || config.repetitions > 1000) {
+            if (std::cin.eof()) {
+                throw std::invalid_argument("Unexpected end of input");
+            }
             std::cin.clear();
             std::cin.ignore(std::numeric_limits<std::streamsize>::max(), '\n');
             std::cout << "Invalid input. Must be between 1 and 1000." << std::endl;
@@ -326,6 +300,45 @@ bool validateResults(size_t serialCount, size_t simdCount, const char* str, size
     return true;
 }
 
+SharedResultRecord* openSharedResultRecord(const std::string& name) {
+    // The driver creates and owns the segment; we only map it
+    int fd = shm_open(name.c_str(), O_RDWR, 0);
+    if (fd < 0) {
+        throw std::runtime_error("Failed to open shared memory: " + name);
+    }
+    
+    struct stat info;
+    if (fstat(fd, &info) != 0 || static_cast<size_t>(info.st_size) < sizeof(SharedResultRecord)) {
+        close(fd);
+        throw std::runtime_error("Shared memory segment too small: " + name);
+    }
+    
+    void* mapped = mmap(nullptr, sizeof(SharedResultRecord), PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+    close(fd);
+    if (mapped == MAP_FAILED) {
+        throw std::runtime_error("Failed to map shared memory: " + name);
+    }
+    
+    return static_cast<SharedResultRecord*>(mapped);
+}
+
+void publishSharedResult(SharedResultRecord* record, const TestConfiguration& config,
+                         double avgTimeMs, double stdDevMs, double throughputMBps) {
+    if (!record) {
+        return;
+    }
+    
+    record->stringLength = config.stringLength;
+    record->alignment = config.alignment;
+    record->repetitions = config.repetitions;
+    record->avgTimeMs = avgTimeMs;
+    record->stdDevMs = stdDevMs;
+    record->throughputMBps = throughputMBps;
+    
+    // Publish the new sequence number only after the payload is in place
+    __atomic_store_n(&record->sequence, record->sequence + 1, __ATOMIC_RELEASE);
+}
+
 /**
  * Display character occurrence results in a readable format
  */
@@ -349,6 +362,14 @@ void displayCharacterOccurrences(char targetChar, size_t occurrences, size_t tot
     std::cout << "====================================" << std::endl;
 }
 
+/**
+ * Mark the end of one test's output so a driver streaming several
+ * configurations through stdin knows when to stop reading
+ */
+void printTestEndMarker() {
+    std::cout << "=== End of Test ===" << std::endl;
+}
+
 /**
  * Export results to CSV format
  */
@@ -407,8 +428,8 @@ void exportResultsCSV(char targetChar, size_t occurrences, size_t totalChars,
     file << "\n";
     
     // Individual execution times
-    file << "# Individual Execution Times\n";
-    file << "Run,ExecutionTime_ms,Throughput_MBps,CharsPerSecond\n";
+    file << "# Per-Batch Average Execution Times\n";
+    file << "Batch,ExecutionTime_ms,Throughput_MBps,CharsPerSecond\n";
     for (size_t i = 0; i < executionTimes.size(); ++i) {
         double throughput = (config.stringLength / (executionTimes[i] / 1000.0)) / (1024.0 * 1024.0);
         double charsPerSec = totalChars / (executionTimes[i] / 1000.0);
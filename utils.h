@@ -17,13 +17,13 @@
 #include <functional>
 #include <algorithm>
 #include <numeric>
+#include <x86intrin.h>
 
 /**
  * Performance metrics structure to standardize measurements
  * between serial and SIMD implementations
  */
 struct PerformanceMetrics {
-    double executionTimeMs = 0.0;
     size_t memoryUsedBytes = 0;
     size_t stringLength = 0;
     size_t alignment = 0;
@@ -32,10 +32,6 @@ struct PerformanceMetrics {
     size_t occurrences = 0;           // Number of occurrences found
     
     void print() const;
-    void printCSVHeader() const;
-    void printCSVRow() const;
-    double getThroughputMBps() const;
-    double getCharactersPerSecond() const;
 };
 
 /**
@@ -43,14 +39,83 @@ struct PerformanceMetrics {
  */
 class HighPrecisionTimer {
 public:
+    /**
+     * Time repetitions of operation in batches. Each batch is bracketed by a
+     * single TSC read pair and reports its average time per call, so the
+     * timer's own cost is spread over the whole batch instead of being
+     * added to every call
+     * @return Average time per call (ms) for each batch
+     */
+    template <typename Operation>
     static std::vector<double> measureExecutionTimes(
-        std::function<size_t()> operation, 
+        Operation&& operation, 
         int repetitions, 
-        int warmup_runs = 5);
+        int warmup_runs = 5,
+        int batches = 10) {
+        
+        batches = std::max(1, std::min(batches, repetitions));
+        std::vector<double> times;
+        times.reserve(batches);
+        
+        // Warmup runs to stabilize cache and CPU
+        for (int i = 0; i < warmup_runs; ++i) {
+            keepResult(operation());
+        }
+        
+        // Spread any remainder over the first batches
+        int baseSize = repetitions / batches;
+        int remainder = repetitions % batches;
+        
+        for (int batch = 0; batch < batches; ++batch) {
+            int batchSize = baseSize + (batch < remainder ? 1 : 0);
+            
+            uint64_t start = startCycles();
+            for (int i = 0; i < batchSize; ++i) {
+                keepResult(operation());
+            }
+            uint64_t end = stopCycles();
+            
+            times.push_back(cyclesToMs(end - start) / batchSize);
+        }
+        
+        return times;
+    }
+    
+    /**
+     * Compiler barrier: keeps a result alive and forces memory to be
+     * re-read, so repeated identical calls can't be hoisted or merged
+     */
+    static inline void keepResult(size_t value) {
+        asm volatile("" : : "r"(value) : "memory");
+    }
     
     static double calculateMedian(std::vector<double> times);
     
     static std::pair<double, double> removeOutliers(const std::vector<double>& times);
+    
+    /**
+     * Read the time stamp counter, fenced so surrounding instructions
+     * cannot be reordered across the read
+     */
+    static inline uint64_t startCycles() {
+        _mm_lfence();
+        uint64_t cycles = __rdtsc();
+        _mm_lfence();
+        return cycles;
+    }
+    
+    static inline uint64_t stopCycles() {
+        unsigned int aux;
+        uint64_t cycles = __rdtscp(&aux);
+        _mm_lfence();
+        return cycles;
+    }
+    
+    /**
+     * Convert a time stamp counter delta to milliseconds using a
+     * frequency calibrated once against the steady clock
+     */
+    static double cyclesToMs(uint64_t cycles);
 };
 
 /**
@@ -104,7 +169,9 @@ public:
     virtual ~CharacterCounterBase() = default;
     
     /**
-     * Count occurrences of a specific character in string
+     * Count occurrences of a specific character in string. Implementations
+     * don't time themselves; callers time whole batches of calls
+     * (see HighPrecisionTimer::measureExecutionTimes)
      * @param str Input string
      * @param length String length (including null terminator)
      * @param targetChar Character to search for
@@ -120,6 +187,22 @@ public:
     virtual std::string getImplementationName() const = 0;
 };
 
+/**
+ * Fixed-layout result record published to POSIX shared memory so a driver
+ * can read binary results instead of parsing the CSV text output.
+ * sequence is incremented after the other fields of each completed test
+ * are written, so a driver can tell a fresh record from a stale one
+ */
+struct SharedResultRecord {
+    uint64_t sequence;
+    uint64_t stringLength;
+    uint64_t alignment;
+    uint64_t repetitions;
+    double avgTimeMs;
+    double stdDevMs;
+    double throughputMBps;
+};
+
 /**
  * Test configuration structure for user input
  */
@@ -131,6 +214,7 @@ struct TestConfiguration {
     bool showDetailedResults;
     uint32_t randomSeed;
     char targetCharacter;             // Character to search for
+    SharedResultRecord* sharedResult = nullptr;  // Optional binary result output
 };
 
 /**
@@ -141,6 +225,13 @@ void validateConfiguration(const TestConfiguration& config);
 bool isPowerOfTwo(size_t value);
 bool validateResults(size_t serialCount, size_t simdCount, const char* str, size_t length, char targetChar);
 
+/**
+ * Shared memory result functions
+ */
+SharedResultRecord* openSharedResultRecord(const std::string& name);
+void publishSharedResult(SharedResultRecord* record, const TestConfiguration& config,
+                         double avgTimeMs, double stdDevMs, double throughputMBps);
+
 /**
  * Performance analysis functions
  */
@@ -151,6 +242,7 @@ void runImprovedPerformanceAnalysis(CharacterCounterBase& counter, const TestCon
  * Display and export functions
  */
 void displayCharacterOccurrences(char targetChar, size_t occurrences, size_t totalChars);
+void printTestEndMarker();
 void exportResultsCSV(char targetChar, size_t occurrences, size_t totalChars, 
                      const std::vector<double>& executionTimes, const TestConfiguration& config,
                      const std::string& filename = "results.csv");